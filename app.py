@@ -16,6 +16,10 @@
 #   TGIM_MARGIN_RETRY=2
 #   TGIM_MAX_SPREAD_PIPS=0          # 0/off = do not block by spread
 #   TGIM_SPREAD_BUFFER_PIPS=0       # optional extra reserve in sizing math
+#   TGIM_ADMIN_TOKEN=               # empty = /admin/profile disabled
+#   TGIM_PROFILE_SLOW_MS=0          # 0/off = no automatic slow-request capture
+#   TGIM_PROFILE_INTERVAL_MS=5      # stack sampling interval while profiling
+#   TGIM_PROFILE_KEEP=20            # captures kept in memory per process
 #
 # Main protections:
 #   1) No hedge: opposite side must close and verify before new side opens.
@@ -23,17 +27,29 @@
 #   3) Dynamic OANDA margin sizing per instrument using live marginRate.
 #   4) Live spread fetched from OANDA pricing endpoint and logged/returned.
 #   5) Optional max-spread blocker.
+#
+# Profiling (admin only, off by default):
+#   POST /admin/profile {"requests": N} or {"seconds": S} arms sampling for the next webhooks.
+#   Webhooks slower than TGIM_PROFILE_SLOW_MS (or "slow_ms") are captured automatically.
+#   GET  /admin/profile/<id|latest|all>?format=json|collapsed|pstats exports a capture.
 
 from __future__ import annotations
 
+import hmac
 import json
+import marshal
 import os
+import sys
+import threading
 import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from decimal import Decimal, InvalidOperation, ROUND_DOWN, ROUND_HALF_UP, getcontext
 from typing import Any, Dict, Optional, Tuple
 
 import requests
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 
 getcontext().prec = 28
 app = Flask(__name__)
@@ -69,6 +85,9 @@ MARGIN_RETRY = int(os.environ.get("TGIM_MARGIN_RETRY", "2"))
 MAX_SPREAD_PIPS = Decimal(os.environ.get("TGIM_MAX_SPREAD_PIPS", "0"))
 SPREAD_BUFFER_PIPS = Decimal(os.environ.get("TGIM_SPREAD_BUFFER_PIPS", "0"))
 
+ADMIN_TOKEN = os.environ.get("TGIM_ADMIN_TOKEN", "").strip()
+PROFILE_KEEP = max(1, int(os.environ.get("TGIM_PROFILE_KEEP", "20")))
+
 # ──────────────────────────────────────────────
 # Generic helpers
 # ──────────────────────────────────────────────
@@ -146,12 +165,16 @@ def response_json(response: requests.Response) -> Dict[str, Any]:
 
 
 def log_event(tag: str, payload: Any) -> None:
-    print(f"\n===== {tag} =====")
-    try:
-        print(json.dumps(payload, indent=2, ensure_ascii=False)[:5000])
-    except Exception:
-        print(str(payload)[:5000])
-    print("====================\n")
+    # Serialization and stdout writes are separate stages so a slow log pipe is not blamed on json.dumps.
+    with profile_stage("log:json"):
+        try:
+            text = json.dumps(payload, indent=2, ensure_ascii=False)[:5000]
+        except Exception:
+            text = str(payload)[:5000]
+    with profile_stage("log:print"):
+        print(f"\n===== {tag} =====")
+        print(text)
+        print("====================\n")
 
 
 def log_oanda_response(tag: str, response: requests.Response) -> Dict[str, Any]:
@@ -162,11 +185,14 @@ def log_oanda_response(tag: str, response: requests.Response) -> Dict[str, Any]:
             req_body = req_body.decode(errors="replace")
     except Exception:
         req_body = "<unavailable>"
-    print(f"\n🔹 [{tag}] Status: {response.status_code}")
-    print("🔸 URL:", response.url)
-    print("📦 Payload snippet:", str(req_body)[:1500])
-    print("📜 Response snippet:", json.dumps(body, ensure_ascii=False)[:3000])
-    print("──────────────────────────────────────────────\n")
+    with profile_stage("log:json"):
+        body_text = json.dumps(body, ensure_ascii=False)[:3000]
+    with profile_stage("log:print"):
+        print(f"\n🔹 [{tag}] Status: {response.status_code}")
+        print("🔸 URL:", response.url)
+        print("📦 Payload snippet:", str(req_body)[:1500])
+        print("📜 Response snippet:", body_text)
+        print("──────────────────────────────────────────────\n")
     return body
 
 
@@ -178,11 +204,219 @@ def tv_response(payload: Dict[str, Any], status: int = 200):
 def hard_error(payload: Dict[str, Any], status: int = 400):
     return jsonify(payload), status
 
+# ──────────────────────────────────────────────
+# Profiling
+# ──────────────────────────────────────────────
+# One shared sampler thread walks sys._current_frames() for the webhook threads being profiled.
+# Nothing is registered and no thread runs unless a capture is armed or a slow threshold is set,
+# so the idle cost is a few dict lookups per request. State is per process (per gunicorn worker).
+def profile_env_ms(name: str, default: str, low: str, high: str) -> float:
+    # "off" means 0. Empty, unparseable, non-finite or below-range values fall back to the default instead of failing at boot.
+    raw = os.environ.get(name, "").strip().lower() or default
+    val = d("0" if raw == "off" else raw, "NaN")
+    if not val.is_finite() or val < Decimal(low):
+        val = Decimal(default)
+    return float(min(Decimal(high), val))
+
+
+PROFILE_SLOW_MS = profile_env_ms("TGIM_PROFILE_SLOW_MS", "0", "0", "3600000")
+PROFILE_INTERVAL_MS = profile_env_ms("TGIM_PROFILE_INTERVAL_MS", "5", "1", "1000")
+
+_PROF_LOCK = threading.Lock()
+_PROF_LOCAL = threading.local()
+_PROF: Dict[str, Any] = {
+    "remaining": 0,
+    "until": 0.0,
+    "slow_ms": PROFILE_SLOW_MS,
+    "interval_ms": PROFILE_INTERVAL_MS,
+    "seq": 0,
+    "sampler": None,
+}
+_PROF_ACTIVE: Dict[int, Dict[str, Any]] = {}
+_PROF_CAPTURES: deque = deque(maxlen=PROFILE_KEEP)
+
+
+def _profile_stack(frame: Any) -> Tuple[Tuple[str, int, str], ...]:
+    stack = []
+    while frame is not None and len(stack) < 256:
+        code = frame.f_code
+        stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+def _profile_sampler_loop() -> None:
+    me = threading.current_thread()
+    try:
+        while True:
+            with _PROF_LOCK:
+                if not _PROF_ACTIVE:
+                    _PROF["sampler"] = None
+                    return
+                interval_ms = _PROF["interval_ms"]
+                active = list(_PROF_ACTIVE.items())
+                frames = sys._current_frames()
+            # Walk stacks outside the lock; webhook threads in profile_begin/profile_end only wait for the counter update.
+            stacks = [(tid, rec, _profile_stack(frames[tid])) for tid, rec in active if tid in frames]
+            del frames
+            now = time.perf_counter()
+            with _PROF_LOCK:
+                for tid, rec, stack in stacks:
+                    if _PROF_ACTIVE.get(tid) is rec:
+                        # Weight each sample by the measured gap since the previous one, so changing
+                        # interval_ms mid-request (or scheduler jitter) does not skew exported times.
+                        rec["samples"][stack] += 1
+                        rec["sampleSecs"][stack] += now - rec.get("lastSample", rec["t0"])
+                        rec["lastSample"] = now
+            time.sleep(interval_ms / 1000)
+    finally:
+        # If the loop dies unexpectedly, let the next profiled request start a fresh sampler.
+        with _PROF_LOCK:
+            if _PROF["sampler"] is me:
+                _PROF["sampler"] = None
+
+
+def profile_begin() -> None:
+    if _PROF["slow_ms"] <= 0 and _PROF["remaining"] <= 0 and _PROF["until"] <= time.monotonic():
+        return
+    with _PROF_LOCK:
+        armed = _PROF["until"] > time.monotonic()
+        if not armed and _PROF["remaining"] > 0:
+            _PROF["remaining"] -= 1
+            armed = True
+        if not armed and _PROF["slow_ms"] <= 0:
+            return
+        _PROF["seq"] += 1
+        rec = {
+            "id": f"{int(time.time() * 1000)}-{_PROF['seq']}",
+            "started": datetime.now(timezone.utc).isoformat(),
+            "armed": armed,
+            "intervalMs": _PROF["interval_ms"],
+            "t0": time.perf_counter(),
+            "samples": Counter(),
+            "sampleSecs": Counter(),
+            "stages": {},
+        }
+        _PROF_ACTIVE[threading.get_ident()] = rec
+        if _PROF["sampler"] is None:
+            _PROF["sampler"] = threading.Thread(target=_profile_sampler_loop, name="tgim-profiler", daemon=True)
+            _PROF["sampler"].start()
+    _PROF_LOCAL.record = rec
+
+
+def profile_end() -> None:
+    rec = getattr(_PROF_LOCAL, "record", None)
+    if rec is None:
+        return
+    _PROF_LOCAL.record = None
+    duration_ms = (time.perf_counter() - rec["t0"]) * 1000
+    with _PROF_LOCK:
+        _PROF_ACTIVE.pop(threading.get_ident(), None)
+        slow = _PROF["slow_ms"] > 0 and duration_ms >= _PROF["slow_ms"]
+        if not rec["armed"] and not slow:
+            return
+        rec["durationMs"] = round(duration_ms, 3)
+        rec["slow"] = slow
+        _PROF_CAPTURES.append(rec)
+    if slow:
+        log_event("PROFILE-SLOW-REQUEST", profile_summary(rec))
+
+
+@contextmanager
+def profile_stage(name: str):
+    # Stage timings only accumulate for requests that are being profiled.
+    rec = getattr(_PROF_LOCAL, "record", None)
+    if rec is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        st = rec["stages"].setdefault(name, {"count": 0, "ms": 0.0})
+        st["count"] += 1
+        st["ms"] += (time.perf_counter() - t0) * 1000
+
+
+def profile_summary(rec: Dict[str, Any]) -> Dict[str, Any]:
+    stages = sorted(rec["stages"].items(), key=lambda kv: kv[1]["ms"], reverse=True)
+    return {
+        "id": rec["id"],
+        "started": rec["started"],
+        "reason": "armed" if rec["armed"] else "slow",
+        "slow": rec.get("slow", False),
+        "durationMs": rec.get("durationMs"),
+        "action": rec.get("action"),
+        "instrument": rec.get("instrument"),
+        "httpStatus": rec.get("httpStatus"),
+        "intervalMs": rec["intervalMs"],
+        "samples": sum(rec["samples"].values()),
+        "stages": {name: {"count": st["count"], "ms": round(st["ms"], 3)} for name, st in stages},
+    }
+
+
+def profile_collapsed(recs: list[Dict[str, Any]]) -> str:
+    # Brendan Gregg collapsed format: "root;child;leaf count", one stack per line.
+    counts: Counter = Counter()
+    for rec in recs:
+        counts.update(rec["samples"])
+    lines = [
+        ";".join(f"{name} ({os.path.basename(filename)}:{lineno})" for filename, lineno, name in stack) + f" {n}"
+        for stack, n in counts.items()
+    ]
+    return "\n".join(sorted(lines)) + "\n"
+
+
+def profile_pstats(recs: list[Dict[str, Any]]) -> bytes:
+    # Marshalled pstats dict built from samples; load with pstats.Stats(path) or snakeviz.
+    # Call counts are sample counts; times are the measured gaps between samples.
+    stats: Dict[Tuple[str, int, str], list] = {}
+    callers: Dict[Tuple[str, int, str], Dict[Tuple[str, int, str], list]] = {}
+    for rec in recs:
+        for stack, n in rec["samples"].items():
+            secs = rec["sampleSecs"][stack]
+            for func in set(stack):
+                entry = stats.setdefault(func, [0, 0, 0.0, 0.0])
+                entry[0] += n
+                entry[1] += n
+                entry[3] += secs
+            stats[stack[-1]][2] += secs
+            for parent, child in set(zip(stack, stack[1:])):
+                edge = callers.setdefault(child, {}).setdefault(parent, [0, 0, 0.0, 0.0])
+                edge[0] += n
+                edge[1] += n
+                edge[3] += secs
+    out = {
+        func: (cc, nc, tt, ct, {parent: tuple(edge) for parent, edge in callers.get(func, {}).items()})
+        for func, (cc, nc, tt, ct) in stats.items()
+    }
+    return marshal.dumps(out)
+
+
+def profile_param(data: Dict[str, Any], key: str, low: Decimal, high: Decimal) -> Optional[Decimal]:
+    raw = data.get(key)
+    if raw in (None, ""):
+        return None
+    val = d(raw, "NaN")
+    if not val.is_finite() or val < low or val > high:
+        raise ValueError(key)
+    return val
+
+
+def admin_authorized() -> bool:
+    supplied = request.headers.get("X-Admin-Token", "").strip()
+    auth = request.headers.get("Authorization", "")
+    if not supplied and auth.lower().startswith("bearer "):
+        supplied = auth[7:].strip()
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(supplied.encode(), ADMIN_TOKEN.encode())
+
 # ──────────────────────────────────────────────
 # OANDA read helpers
 # ──────────────────────────────────────────────
 def get_account_summary() -> Tuple[int, Dict[str, Any]]:
-    r = requests.get(SUMMARY_URL, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+    with profile_stage("oanda:summary"):
+        r = requests.get(SUMMARY_URL, headers=HEADERS, timeout=REQUEST_TIMEOUT)
     body = log_oanda_response("OANDA-ACCOUNT-SUMMARY", r)
     return r.status_code, body
 
@@ -205,7 +439,8 @@ def get_account_snapshot() -> Tuple[int, Dict[str, Any]]:
 
 
 def get_instruments_map() -> Tuple[int, Dict[str, Any]]:
-    r = requests.get(INSTRUMENTS_URL, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+    with profile_stage("oanda:instruments"):
+        r = requests.get(INSTRUMENTS_URL, headers=HEADERS, timeout=REQUEST_TIMEOUT)
     body = log_oanda_response("OANDA-INSTRUMENTS", r)
     if r.status_code >= 300:
         return r.status_code, {"ok": False, "body": body}
@@ -241,7 +476,8 @@ def get_instrument_details(instrument: str) -> Tuple[int, Dict[str, Any]]:
 
 def get_pricing(instruments: list[str]) -> Tuple[int, Dict[str, Any]]:
     params = {"instruments": ",".join(instruments), "includeHomeConversions": "true"}
-    r = requests.get(PRICING_URL, headers=HEADERS, params=params, timeout=REQUEST_TIMEOUT)
+    with profile_stage("oanda:pricing"):
+        r = requests.get(PRICING_URL, headers=HEADERS, params=params, timeout=REQUEST_TIMEOUT)
     body = log_oanda_response("OANDA-PRICING", r)
     return r.status_code, body
 
@@ -307,7 +543,8 @@ def get_market_snapshot(instrument: str, account_currency: str = "USD") -> Tuple
 
 
 def get_open_positions_raw() -> Tuple[int, Dict[str, Any]]:
-    r = requests.get(OPEN_POSITIONS_URL, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+    with profile_stage("oanda:open_positions"):
+        r = requests.get(OPEN_POSITIONS_URL, headers=HEADERS, timeout=REQUEST_TIMEOUT)
     body = log_oanda_response("OANDA-OPEN-POSITIONS", r)
     return r.status_code, body
 
@@ -353,33 +590,34 @@ def dynamic_units_for_instrument(instrument: str, risk_pct: Decimal, side: str,
     if effective_max_spread_pips > 0 and spread_pips > effective_max_spread_pips:
         raise RuntimeError(f"spread_too_wide: spread_pips={spread_pips} max={effective_max_spread_pips}")
 
-    nav = d(acct.get("NAV"), "0")
-    margin_avail = d(acct.get("marginAvailable"), "0")
-    margin_rate = d(inst.get("marginRate"), "0")
-    quote_to_home = d(mkt.get("quoteToHomeConversion"), "1")
-    mid = d(mkt.get("mid"), "0")
-    pip = d(mkt.get("pipSize"), "0.0001")
+    with profile_stage("sizing_math"):
+        nav = d(acct.get("NAV"), "0")
+        margin_avail = d(acct.get("marginAvailable"), "0")
+        margin_rate = d(inst.get("marginRate"), "0")
+        quote_to_home = d(mkt.get("quoteToHomeConversion"), "1")
+        mid = d(mkt.get("mid"), "0")
+        pip = d(mkt.get("pipSize"), "0.0001")
 
-    if nav <= 0 or margin_rate <= 0 or mid <= 0:
-        raise RuntimeError(f"bad_sizing_inputs: nav={nav} margin_rate={margin_rate} mid={mid}")
+        if nav <= 0 or margin_rate <= 0 or mid <= 0:
+            raise RuntimeError(f"bad_sizing_inputs: nav={nav} margin_rate={margin_rate} mid={mid}")
 
-    target_margin = nav * (risk_pct / Decimal("100"))
-    margin_cap = margin_avail * MARGIN_SAFETY
-    margin_to_use = min(target_margin, margin_cap) if margin_avail > 0 else target_margin
+        target_margin = nav * (risk_pct / Decimal("100"))
+        margin_cap = margin_avail * MARGIN_SAFETY
+        margin_to_use = min(target_margin, margin_cap) if margin_avail > 0 else target_margin
 
-    # OANDA margin approximation for account currency:
-    # units * mid price in quote currency * quote-to-home conversion * marginRate.
-    margin_per_unit = mid * quote_to_home * margin_rate
+        # OANDA margin approximation for account currency:
+        # units * mid price in quote currency * quote-to-home conversion * marginRate.
+        margin_per_unit = mid * quote_to_home * margin_rate
 
-    # Optional spread buffer reserve: units * spread_buffer_pips * pip * quote_to_home.
-    # This is intentionally conservative and small by default/off.
-    spread_buffer_per_unit = SPREAD_BUFFER_PIPS * pip * quote_to_home
-    cost_per_unit = margin_per_unit + spread_buffer_per_unit
-    if cost_per_unit <= 0:
-        raise RuntimeError(f"bad_cost_per_unit: {cost_per_unit}")
+        # Optional spread buffer reserve: units * spread_buffer_pips * pip * quote_to_home.
+        # This is intentionally conservative and small by default/off.
+        spread_buffer_per_unit = SPREAD_BUFFER_PIPS * pip * quote_to_home
+        cost_per_unit = margin_per_unit + spread_buffer_per_unit
+        if cost_per_unit <= 0:
+            raise RuntimeError(f"bad_cost_per_unit: {cost_per_unit}")
 
-    units_raw = margin_to_use / cost_per_unit
-    units = floor_units(units_raw)
+        units_raw = margin_to_use / cost_per_unit
+        units = floor_units(units_raw)
 
     return units, {
         "mode": "dynamic_margin",
@@ -440,7 +678,8 @@ def place_market_order(instrument: str, signed_units: int) -> Tuple[int, Dict[st
             "positionFill": "DEFAULT",
         }
     }
-    r = requests.post(ORDERS_URL, headers=HEADERS, json=payload, timeout=REQUEST_TIMEOUT)
+    with profile_stage("oanda:order"):
+        r = requests.post(ORDERS_URL, headers=HEADERS, json=payload, timeout=REQUEST_TIMEOUT)
     body = log_oanda_response("OANDA-ORDER", r)
     return r.status_code, body
 
@@ -466,12 +705,14 @@ def close_position(instrument: str, side: str, ignore_if_flat: bool = True) -> T
 
     url = f"{POSITIONS_URL}/{instrument}/close"
     payload = {close_field: "ALL"}
-    r = requests.put(url, headers=HEADERS, json=payload, timeout=REQUEST_TIMEOUT)
+    with profile_stage("oanda:close"):
+        r = requests.put(url, headers=HEADERS, json=payload, timeout=REQUEST_TIMEOUT)
     body = log_oanda_response(f"OANDA-CLOSE-{human_side.upper()}", r)
     if r.status_code >= 300:
         return r.status_code, {"ok": False, "stage": "close_position", "oanda": body}
 
-    time.sleep(0.15)
+    with profile_stage("close_verify_sleep"):
+        time.sleep(0.15)
     found2, long2, short2, raw2, err2 = get_position(instrument)
     if err2:
         return err2["status"], {"ok": False, "stage": "verify_close", "error": err2, "close_response": body}
@@ -543,6 +784,29 @@ def close_all(instrument: str, ignore_if_flat: bool = True) -> Dict[str, Any]:
 # ──────────────────────────────────────────────
 # Routes
 # ──────────────────────────────────────────────
+@app.before_request
+def profile_before_request():
+    if request.method == "POST" and request.path == "/webhook":
+        profile_begin()
+
+
+@app.after_request
+def profile_after_request(response):
+    rec = getattr(_PROF_LOCAL, "record", None)
+    if rec is not None:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            rec["action"] = str(data.get("action", "")).lower().strip()
+            rec["instrument"] = normalize(data.get("instrument") or data.get("pair") or data.get("symbol"))
+        rec["httpStatus"] = response.status_code
+    return response
+
+
+@app.teardown_request
+def profile_teardown_request(_exc):
+    profile_end()
+
+
 @app.route("/", methods=["GET", "HEAD"])
 def root():
     return jsonify({
@@ -557,6 +821,7 @@ def root():
         "max_spread_payload_override": True,
         "spread_buffer_pips": str(SPREAD_BUFFER_PIPS),
         "no_hedge_enforced": True,
+        "profiling_endpoint": "/admin/profile" if ADMIN_TOKEN else None,
     })
 
 
@@ -585,6 +850,91 @@ def status_route(instrument: str):
     return tv_response({"ok": True, "instrument": inst, "account": acct, "instrumentDetails": details, "market": mkt, "position": pos})
 
 
+@app.route("/admin/profile", methods=["GET", "POST"])
+def admin_profile_route():
+    if not ADMIN_TOKEN:
+        return hard_error({"ok": False, "error": "admin_disabled"}, 404)
+    if not admin_authorized():
+        return hard_error({"ok": False, "error": "admin_unauthorized"}, 401)
+
+    if request.method == "POST":
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return hard_error({"ok": False, "error": "expected_json_object"}, 400)
+        limits = {
+            "requests": (Decimal("0"), Decimal("10000")),
+            "seconds": (Decimal("0"), Decimal("86400")),
+            "slow_ms": (Decimal("0"), Decimal("3600000")),
+            "interval_ms": (Decimal("1"), Decimal("1000")),
+        }
+        try:
+            params = {key: profile_param(data, key, low, high) for key, (low, high) in limits.items()}
+        except ValueError as e:
+            key = str(e)
+            low, high = limits[key]
+            return hard_error({"ok": False, "error": "bad_profile_param", "param": key, "value": str(data.get(key)), "min": str(low), "max": str(high)}, 400)
+        with _PROF_LOCK:
+            if parse_bool(data.get("stop")):
+                _PROF["remaining"] = 0
+                _PROF["until"] = 0.0
+            if params["requests"] is not None:
+                _PROF["remaining"] = int(params["requests"].to_integral_value(rounding=ROUND_DOWN))
+            if params["seconds"] is not None:
+                seconds = float(params["seconds"])
+                _PROF["until"] = time.monotonic() + seconds if seconds > 0 else 0.0
+            if params["slow_ms"] is not None:
+                _PROF["slow_ms"] = float(params["slow_ms"])
+            if params["interval_ms"] is not None:
+                _PROF["interval_ms"] = float(params["interval_ms"])
+            if parse_bool(data.get("clear")):
+                _PROF_CAPTURES.clear()
+
+    with _PROF_LOCK:
+        state = {
+            "armedRequests": _PROF["remaining"],
+            "armedSecondsLeft": round(max(0.0, _PROF["until"] - time.monotonic()), 3),
+            "slowMs": _PROF["slow_ms"],
+            "intervalMs": _PROF["interval_ms"],
+            "activeRequests": len(_PROF_ACTIVE),
+            "samplerRunning": _PROF["sampler"] is not None,
+        }
+        captures = [profile_summary(rec) for rec in _PROF_CAPTURES]
+    return jsonify({"ok": True, "profiler": state, "captures": captures})
+
+
+@app.route("/admin/profile/<capture_id>", methods=["GET"])
+def admin_profile_export_route(capture_id: str):
+    if not ADMIN_TOKEN:
+        return hard_error({"ok": False, "error": "admin_disabled"}, 404)
+    if not admin_authorized():
+        return hard_error({"ok": False, "error": "admin_unauthorized"}, 401)
+
+    with _PROF_LOCK:
+        recs = list(_PROF_CAPTURES)
+    if capture_id == "latest":
+        recs = recs[-1:]
+    elif capture_id != "all":
+        recs = [rec for rec in recs if rec["id"] == capture_id]
+    if not recs:
+        return hard_error({"ok": False, "error": "capture_not_found", "id": capture_id}, 404)
+
+    fmt = str(request.args.get("format", "json")).lower().strip()
+    if fmt in {"collapsed", "pstats"} and not any(rec["samples"] for rec in recs):
+        # Requests that finish inside one sampling interval have no stacks to export.
+        return hard_error({"ok": False, "error": "no_samples", "id": capture_id, "format": fmt}, 409)
+    if fmt == "collapsed":
+        return Response(profile_collapsed(recs), mimetype="text/plain")
+    if fmt == "pstats":
+        return Response(
+            profile_pstats(recs),
+            mimetype="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="tgim-{capture_id}.prof"'},
+        )
+    if fmt == "json":
+        return jsonify({"ok": True, "captures": [profile_summary(rec) for rec in recs], "collapsed": profile_collapsed(recs)})
+    return hard_error({"ok": False, "error": "bad_format", "format": fmt, "expect": ["json", "collapsed", "pstats"]}, 400)
+
+
 @app.route("/webhook", methods=["POST"])
 def webhook():
     data = request.get_json(silent=True)